@@ -0,0 +1,433 @@
+"""Create CDM tables
+
+Databases whose tables were created by the former db.create_all() at app
+start already match this revision; run "alembic stamp head" once on them
+instead of upgrading.
+
+Revision ID: 00b530e8ade1
+Revises:
+Create Date: 2026-10-15 17:20:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import geoalchemy2
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "00b530e8ade1"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "observation_type",
+        sa.Column("id", sa.Integer(), nullable=False, comment="ID / primary key"),
+        sa.Column(
+            "name",
+            sa.String(),
+            nullable=True,
+            comment="Short name for observation type",
+        ),
+        sa.Column(
+            "description",
+            sa.String(),
+            nullable=True,
+            comment="Description of observation type",
+        ),
+        sa.Column(
+            "link",
+            sa.String(),
+            nullable=True,
+            comment="Link to definition of observation type",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "feature_type",
+        sa.Column("id", sa.Integer(), nullable=False, comment="ID / primary key"),
+        sa.Column(
+            "name", sa.String(), nullable=True, comment="Short name for feature type"
+        ),
+        sa.Column(
+            "description",
+            sa.String(),
+            nullable=True,
+            comment="Description of feature type",
+        ),
+        sa.Column(
+            "link",
+            sa.String(),
+            nullable=True,
+            comment="Link to definition of feature type",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "observed_property",
+        sa.Column("id", sa.Integer(), nullable=False, comment="ID / primary key"),
+        sa.Column(
+            "short_name",
+            sa.String(),
+            nullable=True,
+            comment="Short name representation of observed property, e.g. 'at'",
+        ),
+        sa.Column(
+            "standard_name",
+            sa.String(),
+            nullable=True,
+            comment="CF standard name (if applicable), e.g. 'air_temperature'",
+        ),
+        sa.Column(
+            "units",
+            sa.String(),
+            nullable=True,
+            comment="Canonical units, e.g. 'Kelvin'",
+        ),
+        sa.Column(
+            "description",
+            sa.String(),
+            nullable=True,
+            comment="Description of observed property",
+        ),
+        sa.Column(
+            "link",
+            sa.String(),
+            nullable=True,
+            comment="Link to definition / source of observed property",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "observing_procedure",
+        sa.Column("id", sa.Integer(), nullable=False, comment="ID / primary key"),
+        sa.Column(
+            "name", sa.String(), nullable=True, comment="Name of observing procedure"
+        ),
+        sa.Column(
+            "description",
+            sa.String(),
+            nullable=True,
+            comment="Description of observing procedure",
+        ),
+        sa.Column(
+            "link", sa.String(), nullable=True, comment="Link to further information"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "record_status",
+        sa.Column("id", sa.Integer(), nullable=False, comment="ID / primary key"),
+        sa.Column("name", sa.String(), nullable=True, comment="Short name for status"),
+        sa.Column(
+            "description",
+            sa.String(),
+            nullable=True,
+            comment="Description of the status",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "stations",
+        sa.Column("id", sa.String(), nullable=False, comment="ID / primary key"),
+        sa.Column(
+            "name", sa.String(), nullable=True, comment="Preferred name of station"
+        ),
+        sa.Column(
+            "description", sa.String(), nullable=True, comment="Station description"
+        ),
+        sa.Column(
+            "link",
+            sa.String(),
+            nullable=True,
+            comment="URI to station, e.g. to OSCAR/Surface",
+        ),
+        sa.Column(
+            "location",
+            geoalchemy2.types.Geography(),
+            nullable=True,
+            comment="Location of station",
+        ),
+        sa.Column(
+            "elevation",
+            sa.Numeric(),
+            nullable=True,
+            comment="Elevation of station above mean sea level",
+        ),
+        sa.Column(
+            "wigos_station_identifier",
+            sa.String(),
+            nullable=True,
+            comment="WIGOS station identifier",
+        ),
+        sa.Column(
+            "facility_type",
+            sa.String(),
+            nullable=True,
+            comment="Type of observing facility, fixed land, mobile sea, etc",
+        ),
+        sa.Column(
+            "date_established",
+            sa.String(),
+            nullable=True,
+            comment="Date station was first established",
+        ),
+        sa.Column(
+            "wmo_region",
+            sa.String(),
+            nullable=True,
+            comment="WMO region in which the station is located",
+        ),
+        sa.Column(
+            "territory",
+            sa.String(),
+            nullable=True,
+            comment="Territory the station is located in",
+        ),
+        sa.Column(
+            "valid_from",
+            sa.DateTime(),
+            nullable=True,
+            comment="Date from which the details for this record are valid",
+        ),
+        sa.Column(
+            "valid_to",
+            sa.DateTime(),
+            nullable=True,
+            comment="Date after which the details for this record are no longer valid",
+        ),
+        sa.Column(
+            "version",
+            sa.Integer(),
+            nullable=True,
+            comment="Version number of this record",
+        ),
+        sa.Column(
+            "change_date",
+            sa.DateTime(),
+            nullable=True,
+            comment="Date this record was changed",
+        ),
+        sa.Column(
+            "status",
+            sa.Integer(),
+            nullable=True,
+            comment="Whether this is the latest version or an archived version of the record",
+        ),
+        sa.Column(
+            "comments",
+            sa.String(),
+            nullable=True,
+            comment="Free text comments on this record, for example description of changes made etc",
+        ),
+        sa.ForeignKeyConstraint(["status"], ["record_status.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "sensors",
+        sa.Column("id", sa.String(), nullable=False, comment="ID / primary key"),
+        sa.Column("name", sa.String(), nullable=True, comment="Name of sensor"),
+        sa.Column(
+            "description", sa.String(), nullable=True, comment="Description of sensor"
+        ),
+        sa.Column(
+            "link", sa.String(), nullable=True, comment="Link to further information"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "collections",
+        sa.Column("id", sa.String(), nullable=False, comment="ID / primary key"),
+        sa.Column("name", sa.String(), nullable=True, comment="Name of collection"),
+        sa.Column(
+            "link",
+            sa.String(),
+            nullable=True,
+            comment="Link to further information on collection",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "features",
+        sa.Column("id", sa.String(), nullable=False, comment="ID / primary key"),
+        sa.Column(
+            "type", sa.Integer(), nullable=True, comment="enumerated feature type"
+        ),
+        sa.Column("geometry", geoalchemy2.types.Geography(), nullable=True, comment=""),
+        sa.Column(
+            "parent",
+            sa.String(),
+            nullable=True,
+            comment="Parent feature for this feature if nested",
+        ),
+        sa.ForeignKeyConstraint(["type"], ["feature_type.id"]),
+        sa.ForeignKeyConstraint(["parent"], ["features.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "observations",
+        sa.Column("id", sa.String(), nullable=False, comment="ID / primary key"),
+        sa.Column(
+            "location",
+            geoalchemy2.types.Geography(),
+            nullable=True,
+            comment="location of observation",
+        ),
+        sa.Column(
+            "observation_type",
+            sa.Integer(),
+            nullable=True,
+            comment="Type of observation",
+        ),
+        sa.Column(
+            "phenomenon_start",
+            sa.DateTime(),
+            nullable=True,
+            comment="Start time of the phenomenon being observed or observing period, if missing assumed instantaneous with time given by phenomenon_end",
+        ),
+        sa.Column(
+            "phenomenon_end",
+            sa.DateTime(),
+            nullable=True,
+            comment="End time of the phenomenon being observed or observing period",
+        ),
+        sa.Column(
+            "result_value",
+            sa.Numeric(),
+            nullable=True,
+            comment="The value of the result in numeric representation",
+        ),
+        sa.Column(
+            "result_uom",
+            sa.String(),
+            nullable=True,
+            comment="Units used to represent the value being observed",
+        ),
+        sa.Column(
+            "result_description",
+            sa.String(),
+            nullable=True,
+            comment="String representation of the result if applicable",
+        ),
+        sa.Column(
+            "result_quality",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=True,
+            comment="JSON representation of the result quality, key / value pairs",
+        ),
+        sa.Column(
+            "result_time",
+            sa.DateTime(),
+            nullable=True,
+            comment="Time that the result became available",
+        ),
+        sa.Column(
+            "valid_from",
+            sa.DateTime(),
+            nullable=True,
+            comment="Time that the result starts to be valid",
+        ),
+        sa.Column(
+            "valid_to",
+            sa.DateTime(),
+            nullable=True,
+            comment="Time after which the result is no longer valid",
+        ),
+        sa.Column(
+            "station",
+            sa.String(),
+            nullable=True,
+            comment="Station associated with making the observation, equivalent to OGC OMS 'host'",
+        ),
+        sa.Column(
+            "sensor",
+            sa.String(),
+            nullable=True,
+            comment="Sensor associated with making the observation, equivalent to OGC OMS 'observer'",
+        ),
+        sa.Column(
+            "observed_property",
+            sa.Integer(),
+            nullable=True,
+            comment="The phenomenon, or thing, being observed",
+        ),
+        sa.Column(
+            "observing_procedure",
+            sa.Integer(),
+            nullable=True,
+            comment="Procedure used to make the observation",
+        ),
+        sa.Column(
+            "report_id",
+            sa.String(),
+            nullable=True,
+            comment="Parent report ID, used to link coincident observations together",
+        ),
+        sa.Column(
+            "collection",
+            sa.String(),
+            nullable=True,
+            comment="Primary collection or dataset that this observation belongs to",
+        ),
+        sa.Column(
+            "parameter",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=True,
+            comment="List of key/ value pairs in JSONB",
+        ),
+        sa.Column(
+            "feature_of_interest",
+            sa.String(),
+            nullable=True,
+            comment="Feature that this observation is associated with",
+        ),
+        sa.Column(
+            "version",
+            sa.Integer(),
+            nullable=True,
+            comment="Version number of this record",
+        ),
+        sa.Column(
+            "change_date",
+            sa.DateTime(),
+            nullable=True,
+            comment="Date this record was changed",
+        ),
+        sa.Column(
+            "status",
+            sa.Integer(),
+            nullable=True,
+            comment="Whether this is the latest version or an archived version of the record",
+        ),
+        sa.Column(
+            "comments",
+            sa.String(),
+            nullable=True,
+            comment="Free text comments on this record, for example description of changes made etc",
+        ),
+        sa.ForeignKeyConstraint(["observation_type"], ["observation_type.id"]),
+        sa.ForeignKeyConstraint(["station"], ["stations.id"]),
+        sa.ForeignKeyConstraint(["sensor"], ["sensors.id"]),
+        sa.ForeignKeyConstraint(["observed_property"], ["observed_property.id"]),
+        sa.ForeignKeyConstraint(["observing_procedure"], ["observing_procedure.id"]),
+        sa.ForeignKeyConstraint(["collection"], ["collections.id"]),
+        sa.ForeignKeyConstraint(["feature_of_interest"], ["features.id"]),
+        sa.ForeignKeyConstraint(["status"], ["record_status.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade():
+    op.drop_table("observations")
+    op.drop_table("features")
+    op.drop_table("collections")
+    op.drop_table("sensors")
+    op.drop_table("stations")
+    op.drop_table("record_status")
+    op.drop_table("observing_procedure")
+    op.drop_table("observed_property")
+    op.drop_table("feature_type")
+    op.drop_table("observation_type")
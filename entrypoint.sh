@@ -1,5 +1,13 @@
+# Stop on the first failure, e.g. a failed migration, instead of
+# starting the server against a missing or partial schema.
+set -e
+
 export PYGEOAPI_CONFIG=pygeoapi_config.yml
 export PYGEOAPI_OPENAPI=pygeoapi_openapi.yml
 export FLASK_APP=opencdms_api.main
+# Databases created before the schema was managed by Alembic (by the old
+# db.create_all() at boot) fail here with DuplicateTable; mark them as
+# current once with "alembic stamp head".
+alembic upgrade head
 pygeoapi openapi generate $PYGEOAPI_CONFIG > $PYGEOAPI_OPENAPI
-flask --debug run --host 0.0.0.0 --port 5000
+gunicorn -c gunicorn.conf.py opencdms_api.main:app
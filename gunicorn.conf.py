@@ -0,0 +1,29 @@
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+
+# Import the app once in the master so workers share the loaded modules
+# through copy-on-write after forking.
+preload_app = True
+
+# get_engine_options() sizes each worker's pool from the worker count.
+os.environ.setdefault("WEB_CONCURRENCY", str(workers))
+os.environ.setdefault("GUNICORN_THREADS", str(threads))
+
+
+def post_fork(server, worker):
+    # The pool is only warmed here, once per worker; importing the app in
+    # the preloaded master opens no connections. Any connection inherited
+    # from the master is dropped without being closed.
+    from opencdms_api.db import db
+    from opencdms_api.main import app, warm_db_pool
+
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+    if os.getenv("DB_POOL_WARMUP", "1") == "1":
+        warm_db_pool(app)
@@ -1,16 +1,99 @@
 import opencdms_cdm
 from flask_admin.contrib.sqla import ModelView
-from opencdms_api.db import db
-
-views = (
-    ModelView(opencdms_cdm.Observation_type, db.session),
-    ModelView(opencdms_cdm.Feature_type, db.session),
-    ModelView(opencdms_cdm.Observed_property, db.session),
-    ModelView(opencdms_cdm.Observing_procedure, db.session),
-    ModelView(opencdms_cdm.Record_status, db.session),
-    ModelView(opencdms_cdm.Stations, db.session),
-    ModelView(opencdms_cdm.Sensors, db.session),
-    ModelView(opencdms_cdm.Observations, db.session),
-    ModelView(opencdms_cdm.Collections, db.session),
-    ModelView(opencdms_cdm.Features, db.session),
+from sqlalchemy.orm import load_only
+from opencdms_api.cache import cache
+
+
+class CDMModelView(ModelView):
+    """
+    ModelView for CDM tables.
+
+    Any table may be published through the OGC API, so every change made
+    in the admin panel clears the cache of API responses and admin lists.
+    The clear only reaches every worker when the cache backend is shared
+    (see ``cache.is_shared``); with SimpleCache it is per process.
+    """
+
+    def after_model_change(self, form, model, is_created):
+        cache.clear()
+
+    def after_model_delete(self, model):
+        cache.clear()
+
+
+class CachedModelView(CDMModelView):
+    """
+    ModelView for slowly-changing reference tables.
+
+    List queries are memoized per view for five minutes. Only used when
+    the cache is shared by all workers, as the invalidation in
+    CDMModelView would otherwise leave other workers serving stale lists.
+    """
+
+    def __repr__(self):
+        # memoize keys on repr(self), which must be the same in every
+        # process sharing the cache and unique per view
+        return f"<{type(self).__name__} {self.endpoint}>"
+
+    @cache.memoize(timeout=300)
+    def get_list(self, *args, **kwargs):
+        return super().get_list(*args, **kwargs)
+
+
+class FastModelView(CDMModelView):
+    """
+    ModelView for wide tables that only loads the columns shown in the
+    list view (plus the primary key, which SQLAlchemy always loads).
+    """
+
+    def get_query(self):
+        table_columns = self.model.__table__.columns
+        columns = [
+            getattr(self.model, name)
+            for name, _ in self._list_columns
+            if name in table_columns
+        ]
+        return super().get_query().options(load_only(*columns))
+
+
+# (view class, model, class attributes overriding the view's defaults)
+MODEL_SPECS = (
+    (CachedModelView, opencdms_cdm.Observation_type, {}),
+    (CachedModelView, opencdms_cdm.Feature_type, {}),
+    (CachedModelView, opencdms_cdm.Observed_property, {}),
+    (CachedModelView, opencdms_cdm.Observing_procedure, {}),
+    (CachedModelView, opencdms_cdm.Record_status, {}),
+    (FastModelView, opencdms_cdm.Stations, {"column_exclude_list": ("location",)}),
+    (CDMModelView, opencdms_cdm.Sensors, {}),
+    (
+        FastModelView,
+        opencdms_cdm.Observations,
+        {"column_exclude_list": ("location", "result_quality", "parameter")},
+    ),
+    (CDMModelView, opencdms_cdm.Collections, {}),
+    (FastModelView, opencdms_cdm.Features, {}),
 )
+
+
+def iter_views(session, cache_lists=True):
+    """
+    Create the admin ModelViews for the CDM tables listed in MODEL_SPECS.
+
+    ModelView scaffolds its list columns and WTForms form classes in its
+    constructor, so that work happens here at boot (in the gunicorn master
+    when the app is preloaded) rather than on the first admin page load.
+
+    :param session: scoped session the views should use, e.g. ``db.session``;
+                    it resolves to the session of the current app context
+                    and is removed again on teardown
+    :param cache_lists: memoize the list queries of CachedModelView tables;
+                        otherwise they use a plain CDMModelView
+
+    :returns: generator of ModelView instances
+    """
+    for view_class, model, options in MODEL_SPECS:
+        if view_class is CachedModelView and not cache_lists:
+            view_class = CDMModelView
+        if options:
+            view_class = type(f"{model.__name__}View", (view_class,), options)
+        yield view_class(model, session)
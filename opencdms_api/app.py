@@ -1,5 +1,36 @@
 import os
 from flask import Flask
+from sqlalchemy.pool import QueuePool
+
+
+def get_engine_options():
+    """
+    Build the SQLAlchemy engine options for the connection pool.
+
+    A worker never runs more than ``GUNICORN_THREADS`` requests at once,
+    so the pool defaults to one connection per thread plus a small
+    overflow. The pool is then shrunk so that
+    ``(pool_size + max_overflow) * WEB_CONCURRENCY`` stays below
+    ``DB_MAX_CONNECTIONS`` (default 100, the Postgres ``max_connections``
+    default).
+    """
+    pool_size = int(os.getenv("DB_POOL_SIZE", os.getenv("GUNICORN_THREADS", 8)))
+    max_overflow = int(os.getenv("DB_MAX_OVERFLOW", 2))
+
+    max_connections = int(os.getenv("DB_MAX_CONNECTIONS", 100))
+    workers = int(os.getenv("WEB_CONCURRENCY", 1))
+    per_worker = max(max_connections // workers - 1, 1)
+    max_overflow = min(max_overflow, per_worker // 3)
+    pool_size = min(pool_size, per_worker - max_overflow)
+
+    return {
+        "poolclass": QueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", 30)),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        "pool_pre_ping": True,
+    }
 
 
 def get_app():
@@ -8,5 +39,9 @@ def get_app():
 
     app.config["FLASK_ADMIN_SWATCH"] = "flatly"
     app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("POSTGRES_DSN")
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = get_engine_options()
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["SQLALCHEMY_ECHO"] = False
+    app.config.setdefault("CACHE_TYPE", "SimpleCache")
     app.url_map.strict_slashes = False
     return app
@@ -0,0 +1,29 @@
+import os
+
+from flask_caching import Cache
+
+cache = Cache()
+
+# Backends whose entries live in the memory of a single process.
+PROCESS_LOCAL_CACHE_TYPES = {
+    "null",
+    "NullCache",
+    "simple",
+    "SimpleCache",
+    "flask_caching.backends.NullCache",
+    "flask_caching.backends.SimpleCache",
+}
+
+
+def is_shared(app):
+    """
+    Whether ``cache.clear()`` in one process is seen by every worker.
+
+    :param app: Flask app whose ``CACHE_TYPE`` is checked
+
+    :returns: True for a shared backend (Redis, Memcached, ...) or when a
+              single worker runs, False otherwise
+    """
+    if int(os.getenv("WEB_CONCURRENCY", 1)) <= 1:
+        return True
+    return app.config["CACHE_TYPE"] not in PROCESS_LOCAL_CACHE_TYPES
@@ -1,21 +1,136 @@
-from flask_cors import CORS
-from opencdms_api.pygeoapi.app import BLUEPRINT as pygeoapi_blueprint
+import logging
+import os
+
+from flask import request
+from sqlalchemy.exc import OperationalError
 from opencdms_api.app import get_app
-from flask_admin import Admin
-from opencdms_api.admin import views as admin_views
+from opencdms_api.cache import cache, is_shared
 from opencdms_api.db import db
 
+LOGGER = logging.getLogger(__name__)
+
+# CORS headers are static, so they are built once instead of being
+# computed per request by flask-cors.
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": os.getenv("CORS_ALLOW_ORIGIN", "*"),
+    "Access-Control-Allow-Methods": os.getenv(
+        "CORS_ALLOW_METHODS", "DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+    ),
+    "Access-Control-Allow-Headers": os.getenv("CORS_ALLOW_HEADERS", "*"),
+}
+
+# Read-only OGC API endpoints whose GET responses are cached
+OAPI_CACHED_ENDPOINTS = (
+    "landing_page",
+    "openapi",
+    "conformance",
+    "collections",
+    "collection_queryables",
+    "collection_items",
+)
+
+
+def _add_cors_headers(response):
+    response.headers.update(CORS_HEADERS)
+    return response
+
+
+def _oapi_cache_key():
+    # pygeoapi negotiates format, language and compression from headers
+    # as well as from the query string, so all of them are part of the key.
+    headers = request.headers
+    return "oapi/{}/{}/{}/{}".format(
+        request.full_path,
+        headers.get("Accept", ""),
+        headers.get("Accept-Language", ""),
+        headers.get("Accept-Encoding", ""),
+    )
+
+
+def _add_oapi_etag(response):
+    if (
+        request.blueprint == "pygeoapi"
+        and request.method == "GET"
+        and response.status_code == 200
+    ):
+        response.add_etag()
+        response.make_conditional(request)
+    return response
+
+
+def register_pygeoapi(app):
+    # pygeoapi pulls in shapely, pyproj, jsonschema etc. so it is only
+    # imported when the OGC API blueprint is actually served.
+    from opencdms_api.pygeoapi.app import BLUEPRINT as pygeoapi_blueprint
+
+    app.register_blueprint(pygeoapi_blueprint, url_prefix="/oapi")
+
+    # Admin edits clear this cache, but with a per-process backend such as
+    # the default SimpleCache only in the worker that made the edit; the
+    # other workers serve their copy until it expires. Deployments running
+    # several workers should set FLASK_CACHE_TYPE to a shared backend
+    # (see docker-compose.yml).
+    cached = cache.cached(
+        timeout=60,
+        key_prefix=_oapi_cache_key,
+        unless=lambda: request.method != "GET",
+        response_filter=lambda response: response.status_code == 200,
+    )
+    for endpoint in OAPI_CACHED_ENDPOINTS:
+        endpoint = "{}.{}".format(pygeoapi_blueprint.name, endpoint)
+        app.view_functions[endpoint] = cached(app.view_functions[endpoint])
+
+    app.after_request(_add_oapi_etag)
+
+
+def warm_db_pool(app):
+    """
+    Open a few pool connections up-front so the first burst of requests
+    does not have to wait for connection handshakes.
+
+    At most ``DB_POOL_WARM_SIZE`` connections are opened (default
+    ``GUNICORN_THREADS``), never more than the pool size. Called from the
+    gunicorn ``post_fork`` hook unless ``DB_POOL_WARMUP`` is ``0``.
+    """
+    warm_size = int(os.getenv("DB_POOL_WARM_SIZE", os.getenv("GUNICORN_THREADS", 8)))
+    with app.app_context():
+        engine = db.engine
+        connections = []
+        try:
+            for _ in range(min(engine.pool.size(), warm_size)):
+                connections.append(engine.connect())
+        except OperationalError as err:
+            LOGGER.warning("Could not warm up the database pool: %s", err)
+        finally:
+            for connection in connections:
+                connection.close()
+
+
+def register_admin(app):
+    # flask_admin and the CDM views are only imported when the admin
+    # panel is enabled, keeping plain API workers fast to boot.
+    from flask_admin import Admin
+    from opencdms_api.admin import iter_views
+
+    admin = Admin(app, name="OpenCDMS Admin Panel", template_mode="bootstrap3")
+    admin.add_views(*iter_views(db.session, cache_lists=is_shared(app)))
+
+    return admin
+
 
 app = get_app()
-CORS(app)
+app.after_request(_add_cors_headers)
 
-with app.app_context():
-    db.init_app(app)
-    db.create_all()
+# The schema is managed by Alembic (see alembic/), not created at boot.
+db.init_app(app)
+cache.init_app(app)
 
+if os.getenv("ENABLE_OAPI", "1") == "1":
+    register_pygeoapi(app)
 
-app.register_blueprint(pygeoapi_blueprint, url_prefix="/oapi")
-admin = Admin(app, name="OpenCDMS Admin Panel", template_mode="bootstrap3")
+if os.getenv("ENABLE_ADMIN", "1") == "1":
+    register_admin(app)
 
-for view in admin_views:
-    admin.add_views(view)
+# Compile the routing table now that every blueprint and admin view is
+# registered, instead of on the first request.
+app.url_map.update()
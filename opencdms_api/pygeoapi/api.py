@@ -1,5 +1,7 @@
-import urllib.parse
+import string
 from datetime import datetime
+from functools import lru_cache
+from urllib.parse import quote as _quote
 from typing import Any, Tuple, Union
 
 from pygeoapi import l10n
@@ -13,6 +15,7 @@ from pygeoapi.api import (
     F_HTML,
     LOGGER,
     F_JSONLD,
+    F_GZIP,
     OGC_RELTYPES_BASE,
     validate_bbox,
     validate_datetime,
@@ -33,16 +36,367 @@ from pygeoapi.util import (
     get_provider_by_type,
     get_provider_default,
     render_j2_template,
+    json_serial,
     to_json,
     str2bool,
 )
 from pygeofilter.parsers.ecql import parse as parse_ecql_text
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_FT_JSON = FORMAT_TYPES[F_JSON]
+_FT_JSONLD = FORMAT_TYPES[F_JSONLD]
+_FT_HTML = FORMAT_TYPES[F_HTML]
+
+
+# formats whose link relation depends on the requested format
+_LINKREL_FORMATS = (F_JSON, F_JSONLD, F_HTML)
+
+# Link descriptors: (type, rel, title, href), with href a format string.
+# A rel from _LINKREL_FORMATS stands for the request's link relation for
+# that format.
+_SELF_LINKS = (
+    (_FT_JSON, F_JSON, "This document as JSON", f"{{coll_url}}?f={F_JSON}"),
+    (
+        _FT_JSONLD,
+        F_JSONLD,
+        "This document as RDF (JSON-LD)",
+        f"{{coll_url}}?f={F_JSONLD}",
+    ),
+    (_FT_HTML, F_HTML, "This document as HTML", f"{{coll_url}}?f={F_HTML}"),
+)
+
+_COMMON_LINKS = (
+    (
+        _FT_JSON,
+        "root",
+        "The landing page of this server as JSON",
+        f"{{server_url}}?f={F_JSON}",
+    ),
+    (
+        _FT_HTML,
+        "root",
+        "The landing page of this server as HTML",
+        f"{{server_url}}?f={F_HTML}",
+    ),
+) + _SELF_LINKS
+
+_FEATURE_LINKS = (
+    (
+        _FT_JSON,
+        "queryables",
+        "Queryables for this collection as JSON",
+        f"{{coll_url}}/queryables?f={F_JSON}",
+    ),
+    (
+        _FT_HTML,
+        "queryables",
+        "Queryables for this collection as HTML",
+        f"{{coll_url}}queryables?f={F_HTML}",
+    ),
+    (
+        "application/geo+json",
+        "items",
+        "items as GeoJSON",
+        f"{{coll_url}}/items?f={F_JSON}",
+    ),
+    (
+        _FT_JSONLD,
+        "items",
+        "items as RDF (GeoJSON-LD)",
+        f"{{coll_url}}/items?f={F_JSONLD}",
+    ),
+    (_FT_HTML, "items", "Items as HTML", f"{{coll_url}}/items?f={F_HTML}"),
+)
+
+_COVERAGE_LINKS = (
+    (
+        _FT_JSON,
+        "collection",
+        "Detailed Coverage metadata in JSON",
+        f"{{coll_url}}?f={F_JSON}",
+    ),
+    (
+        _FT_HTML,
+        "collection",
+        "Detailed Coverage metadata in HTML",
+        f"{{coll_url}}?f={F_HTML}",
+    ),
+    (
+        _FT_JSON,
+        f"{OGC_RELTYPES_BASE}/coverage-domainset",
+        "Coverage domain set of collection in JSON",
+        f"{{coll_url}}/coverage/domainset?f={F_JSON}",
+    ),
+    (
+        _FT_HTML,
+        f"{OGC_RELTYPES_BASE}/coverage-domainset",
+        "Coverage domain set of collection in HTML",
+        f"{{coll_url}}/coverage/domainset?f={F_HTML}",
+    ),
+    (
+        _FT_JSON,
+        f"{OGC_RELTYPES_BASE}/coverage-rangetype",
+        "Coverage range type of collection in JSON",
+        f"{{coll_url}}/coverage/rangetype?f={F_JSON}",
+    ),
+    (
+        _FT_HTML,
+        f"{OGC_RELTYPES_BASE}/coverage-rangetype",
+        "Coverage range type of collection in HTML",
+        f"{{coll_url}}/coverage/rangetype?f={F_HTML}",
+    ),
+    (
+        "application/prs.coverage+json",
+        f"{OGC_RELTYPES_BASE}/coverage",
+        "Coverage data",
+        f"{{coll_url}}/coverage?f={F_JSON}",
+    ),
+)
+
+_TILE_LINKS = (
+    (_FT_JSON, "tiles", "Tiles as JSON", f"{{coll_url}}/tiles?f={F_JSON}"),
+    (_FT_HTML, "tiles", "Tiles as HTML", f"{{coll_url}}/tiles?f={F_HTML}"),
+)
+
+
+def _link_templates(descriptors, **fields):
+    """
+    Expand link descriptors into link templates
+
+    :param descriptors: tuple of (type, rel, title, href) descriptors
+    :param fields: values for the href placeholders
+
+    :returns: tuple of (linkrel format or None, link dict) templates
+    """
+
+    return tuple(
+        (
+            rel if rel in _LINKREL_FORMATS else None,
+            {
+                "type": type_,
+                "rel": rel,
+                "title": title,
+                "href": href.format(**fields),
+            },
+        )
+        for type_, rel, title, href in descriptors
+    )
+
+
+def _fill_links(templates, linkrels):
+    """
+    Build the link objects of a request from link templates
+
+    :param templates: tuple of templates made by _link_templates
+    :param linkrels: `dict` of the request's link relations by format
+
+    :returns: list of link dicts
+    """
+
+    return [{**link, "rel": linkrels[f]} if f else link.copy() for f, link in templates]
+
+
+# Translations of config values keyed by (id(value), locale). The value is
+# kept in the entry so that its id cannot be reused while it is cached.
+_TRANSLATIONS = {}
+
+
+def _tr(value, locale):
+    """
+    Memoized l10n.translate for values taken from the (static) config
+
+    :param value: a string or language struct from the config
+    :param locale: the requested locale
+
+    :returns: the translated value
+    """
+
+    if not isinstance(value, dict):
+        # l10n.translate returns anything but a language struct as-is
+        return value
+
+    key = (id(value), locale)
+    entry = _TRANSLATIONS.get(key)
+    if entry is None or entry[0] is not value:
+        entry = _TRANSLATIONS[key] = (value, l10n.translate(value, locale))
+    return entry[1]
+
+
+@lru_cache(maxsize=1024)
+def _parse_ecql_cached(text):
+    """
+    Parse an ECQL filter, caching the AST of recently seen filter strings
+
+    Parse errors are not cached, so bad strings raise again on every call.
+
+    :param text: the ECQL filter text
+
+    :returns: the parsed filter AST
+    """
+
+    return parse_ecql_text(text)
+
+
+# characters urllib.parse.quote never escapes
+_UNRESERVED = frozenset(string.ascii_letters + string.digits + "_.-~")
+# (safe characters, ASCII percent-encoding table) keyed by quote's safe arg
+_QUOTE_TABLES = {}
+
+
+def _fast_quote(text, safe=""):
+    """
+    urllib.parse.quote, returning text that needs no escaping as-is and
+    escaping ASCII text with a single str.translate
+
+    :param text: the string to quote
+    :param safe: characters that should not be quoted
+
+    :returns: the quoted string
+    """
+
+    entry = _QUOTE_TABLES.get(safe)
+    if entry is None:
+        safe_chars = _UNRESERVED.union(safe)
+        table = {i: f"%{i:02X}" for i in range(128) if chr(i) not in safe_chars}
+        entry = _QUOTE_TABLES[safe] = (safe_chars, table)
+    safe_chars, table = entry
+    if safe_chars.issuperset(text):
+        return text
+    if text.isascii():
+        return text.translate(table)
+    # non-ASCII text is percent-encoded per UTF-8 byte
+    return _quote(text, safe)
+
+
+# messages for provider errors raised by a query, most specific first
+_PROVIDER_ERR_MSGS = {
+    ProviderConnectionError: "connection error (check logs)",
+    ProviderQueryError: "query error (check logs)",
+    ProviderGenericError: "generic error (check logs)",
+}
+
+# query parameters that are not carried over into the items links
+_UNFORWARDED_PARAMS = frozenset(("f", "offset"))
+
+# query parameters that are never treated as property filters
+_RESERVED_FIELDNAMES = frozenset(
+    (
+        "bbox",
+        "f",
+        "lang",
+        "limit",
+        "offset",
+        "resulttype",
+        "datetime",
+        "sortby",
+        "properties",
+        "skipGeometry",
+        "q",
+        "filter",
+        "filter-lang",
+    )
+)
+
 
 class CustomPyGeoAPI(API):
     def __init__(self, config):
         super().__init__(config)
 
+        # the config is not modified after start-up, so the collection
+        # resources only need to be filtered once
+        self._collections = filter_dict_by_key_value(
+            self.config["resources"], "type", "collection"
+        )
+
+        self._default_limit = int(self.config["server"]["limit"])
+
+        # rendered queryables keyed by (dataset, locale, format); provider
+        # fields are read once per provider instance, so they do not change
+        self._queryables_cache = {}
+
+        self._default_providers = {
+            k: get_provider_default(v["providers"])
+            for k, v in self._collections.items()
+        }
+
+        self._provider_types = {
+            k: frozenset(p["type"] for p in v.get("providers", []))
+            for k, v in self._collections.items()
+        }
+
+        # The output should be an array of bbox, so if the user only
+        # provided a single bbox, wrap it in an array.
+        self._bboxes = {}
+        for k, v in self._collections.items():
+            bbox = ((v.get("extents") or {}).get("spatial") or {}).get("bbox")
+            if bbox:
+                self._bboxes[k] = bbox if isinstance(bbox[0], list) else [bbox]
+
+        # The generated collection links only depend on the config, so they
+        # are built once; requests only fill in the rels of the self links.
+        collections_url = self.get_collections_url()
+        server_url = self.config["server"]["url"]
+        self._collections_links = _link_templates(_SELF_LINKS, coll_url=collections_url)
+        self._collection_links = {}
+        for k in self._collections:
+            collection_data = self._default_providers[k]
+            collection_data_type = collection_data["type"]
+            collection_data_format = collection_data.get("format")
+            collection_url = f"{collections_url}/{k}"
+
+            templates = _link_templates(
+                _COMMON_LINKS, server_url=server_url, coll_url=collection_url
+            )
+            if collection_data_type in ["feature", "record", "tile"]:
+                templates += _link_templates(_FEATURE_LINKS, coll_url=collection_url)
+            elif collection_data_type == "coverage":
+                templates += _link_templates(_COVERAGE_LINKS, coll_url=collection_url)
+                if collection_data_format is not None:
+                    data_format = collection_data_format["name"]
+                    templates += (
+                        (
+                            None,
+                            {
+                                "type": collection_data_format["mimetype"],
+                                "rel": f"{OGC_RELTYPES_BASE}/coverage",
+                                "title": f"Coverage data as {data_format}",
+                                "href": f"{collection_url}/coverage?f={data_format}",
+                            },
+                        ),
+                    )
+            if "tile" in self._provider_types[k]:
+                templates += _link_templates(_TILE_LINKS, coll_url=collection_url)
+            self._collection_links[k] = templates
+
+    def _to_json(self, obj, binary=False):
+        """
+        Serialize a response document, using orjson when it is installed
+
+        Pretty printed orjson output is indented by two spaces rather than
+        the four used by pygeoapi's to_json.
+
+        :param obj: `dict` of JSON representation
+        :param binary: `bool` of whether to return UTF-8 encoded bytes,
+                       which orjson produces without an intermediate str
+
+        :returns: JSON string (or bytes) representation
+        """
+
+        if orjson is None:
+            content = to_json(obj, self.pretty_print)
+            return content.encode("utf-8") if binary else content
+
+        option = orjson.OPT_NON_STR_KEYS
+        if self.pretty_print:
+            option |= orjson.OPT_INDENT_2
+
+        content = orjson.dumps(obj, default=json_serial, option=option)
+        return content if binary else content.decode("utf-8")
+
     @gzip
     @pre_process
     @jsonldify
@@ -64,257 +418,83 @@ class CustomPyGeoAPI(API):
 
         fcm = {"collections": [], "links": []}
 
-        collections = filter_dict_by_key_value(
-            self.config["resources"], "type", "collection"
-        )
-
-        if all([dataset is not None, dataset not in collections.keys()]):
-            msg = "Collection not found"
-            return self.get_exception(404, headers, request.format, "NotFound", msg)
+        # JSON-LD collection lists are mapped while the collections are built.
+        # jsonldify_collection only maps keys; the @context is shared through
+        # self.fcmld, so there is no per-collection context expansion to batch.
+        want_jsonld = request.format == F_JSONLD
+        want_html = request.format == F_HTML
+        jsonld_collections = []
 
         if dataset is not None:
-            collections_dict = {k: v for k, v in collections.items() if k == dataset}
+            if dataset not in self._collections:
+                msg = "Collection not found"
+                return self.get_exception(404, headers, request.format, "NotFound", msg)
+            collections_dict = {dataset: self._collections[dataset]}
         else:
-            collections_dict = collections
+            collections_dict = self._collections
+
+        collections_url = self.get_collections_url()
+        locale = request.locale
+        linkrels = {f: request.get_linkrel(f) for f in _LINKREL_FORMATS}
 
         LOGGER.debug("Creating collections")
         for k, v in collections_dict.items():
             if v.get("visibility", "default") == "hidden":
                 LOGGER.debug("Skipping hidden layer: {}".format(k))
                 continue
-            collection_data = get_provider_default(v["providers"])
-            collection_data_type = collection_data["type"]
-
-            collection_data_format = None
+            collection_data_type = self._default_providers[k]["type"]
 
-            if "format" in collection_data:
-                collection_data_format = collection_data["format"]
+            collection_url = f"{collections_url}/{k}"
+            links = []
 
             collection = {
                 "id": k,
-                "title": l10n.translate(v["title"], request.locale),
-                "description": l10n.translate(v["description"], request.locale),  # noqa
-                "keywords": l10n.translate(v["keywords"], request.locale),
-                "links": [],
+                "title": _tr(v["title"], locale),
+                "description": _tr(v["description"], locale),  # noqa
+                "keywords": _tr(v["keywords"], locale),
+                "links": links,
             }
 
-            if v.get("extents"):
-
-                bbox = v["extents"]["spatial"]["bbox"]
-                # The output should be an array of bbox, so if the user only
-                # provided a single bbox, wrap it in an array.
-                if not isinstance(bbox[0], list):
-                    bbox = [bbox]
-                collection["extent"] = {"spatial": {"bbox": bbox}}
+            extents = v.get("extents")
+            if extents:
+                spatial = extents["spatial"]
+                spatial_extent = {"bbox": self._bboxes[k]}
+                if "crs" in spatial:
+                    spatial_extent["crs"] = spatial["crs"]
+                collection["extent"] = {"spatial": spatial_extent}
 
-                if "crs" in v["extents"]["spatial"]:
-                    collection["extent"]["spatial"]["crs"] = v["extents"]["spatial"][
-                        "crs"
-                    ]
-
-                t_ext = v.get("extents", {}).get("temporal", {})
+                t_ext = extents.get("temporal")
                 if t_ext:
                     begins = dategetter("begin", t_ext)
                     ends = dategetter("end", t_ext)
-                    collection["extent"]["temporal"] = {"interval": [[begins, ends]]}
+                    temporal_extent = {"interval": [[begins, ends]]}
                     if "trs" in t_ext:
-                        collection["extent"]["temporal"]["trs"] = t_ext["trs"]
+                        temporal_extent["trs"] = t_ext["trs"]
+                    collection["extent"]["temporal"] = temporal_extent
 
-            for link in l10n.translate(v["links"], request.locale):
+            for link in _tr(v["links"], locale):
                 lnk = {
                     "type": link["type"],
                     "rel": link["rel"],
-                    "title": l10n.translate(link["title"], request.locale),
-                    "href": l10n.translate(link["href"], request.locale),
+                    "title": _tr(link["title"], locale),
+                    "href": _tr(link["href"], locale),
                 }
                 if "hreflang" in link:
-                    lnk["hreflang"] = l10n.translate(link["hreflang"], request.locale)
+                    lnk["hreflang"] = _tr(link["hreflang"], locale)
 
-                collection["links"].append(lnk)
+                links.append(lnk)
 
             # TODO: provide translations
-            LOGGER.debug("Adding JSON and HTML link relations")
-            collection["links"].append(
-                {
-                    "type": FORMAT_TYPES[F_JSON],
-                    "rel": "root",
-                    "title": "The landing page of this server as JSON",
-                    "href": "{}?f={}".format(self.config["server"]["url"], F_JSON),
-                }
-            )
-            collection["links"].append(
-                {
-                    "type": FORMAT_TYPES[F_HTML],
-                    "rel": "root",
-                    "title": "The landing page of this server as HTML",
-                    "href": "{}?f={}".format(self.config["server"]["url"], F_HTML),
-                }
-            )
-            collection["links"].append(
-                {
-                    "type": FORMAT_TYPES[F_JSON],
-                    "rel": request.get_linkrel(F_JSON),
-                    "title": "This document as JSON",
-                    "href": "{}/{}?f={}".format(self.get_collections_url(), k, F_JSON),
-                }
-            )
-            collection["links"].append(
-                {
-                    "type": FORMAT_TYPES[F_JSONLD],
-                    "rel": request.get_linkrel(F_JSONLD),
-                    "title": "This document as RDF (JSON-LD)",
-                    "href": "{}/{}?f={}".format(
-                        self.get_collections_url(), k, F_JSONLD
-                    ),
-                }
-            )
-            collection["links"].append(
-                {
-                    "type": FORMAT_TYPES[F_HTML],
-                    "rel": request.get_linkrel(F_HTML),
-                    "title": "This document as HTML",
-                    "href": "{}/{}?f={}".format(self.get_collections_url(), k, F_HTML),
-                }
-            )
+            LOGGER.debug("Adding JSON, HTML and provider based link relations")
+            links.extend(_fill_links(self._collection_links[k], linkrels))
 
             if collection_data_type in ["feature", "record", "tile"]:
                 # TODO: translate
                 collection["itemType"] = collection_data_type
-                LOGGER.debug("Adding feature/record based links")
-                collection["links"].append(
-                    {
-                        "type": FORMAT_TYPES[F_JSON],
-                        "rel": "queryables",
-                        "title": "Queryables for this collection as JSON",
-                        "href": "{}/{}/queryables?f={}".format(
-                            self.get_collections_url(), k, F_JSON
-                        ),
-                    }
-                )
-                collection["links"].append(
-                    {
-                        "type": FORMAT_TYPES[F_HTML],
-                        "rel": "queryables",
-                        "title": "Queryables for this collection as HTML",
-                        "href": "{}/{}queryables?f={}".format(
-                            self.get_collections_url(), k, F_HTML
-                        ),
-                    }
-                )
-                collection["links"].append(
-                    {
-                        "type": "application/geo+json",
-                        "rel": "items",
-                        "title": "items as GeoJSON",
-                        "href": "{}/{}/items?f={}".format(
-                            self.get_collections_url(), k, F_JSON
-                        ),
-                    }
-                )
-                collection["links"].append(
-                    {
-                        "type": FORMAT_TYPES[F_JSONLD],
-                        "rel": "items",
-                        "title": "items as RDF (GeoJSON-LD)",
-                        "href": "{}/{}/items?f={}".format(
-                            self.get_collections_url(), k, F_JSONLD
-                        ),
-                    }
-                )
-                collection["links"].append(
-                    {
-                        "type": FORMAT_TYPES[F_HTML],
-                        "rel": "items",
-                        "title": "Items as HTML",
-                        "href": "{}/{}/items?f={}".format(
-                            self.get_collections_url(), k, F_HTML
-                        ),
-                    }
-                )
 
             elif collection_data_type == "coverage":
-                # TODO: translate
-                LOGGER.debug("Adding coverage based links")
-                collection["links"].append(
-                    {
-                        "type": FORMAT_TYPES[F_JSON],
-                        "rel": "collection",
-                        "title": "Detailed Coverage metadata in JSON",
-                        "href": "{}/{}?f={}".format(
-                            self.get_collections_url(), k, F_JSON
-                        ),
-                    }
-                )
-                collection["links"].append(
-                    {
-                        "type": FORMAT_TYPES[F_HTML],
-                        "rel": "collection",
-                        "title": "Detailed Coverage metadata in HTML",
-                        "href": "{}/{}?f={}".format(
-                            self.get_collections_url(), k, F_HTML
-                        ),
-                    }
-                )
-                coverage_url = "{}/{}/coverage".format(self.get_collections_url(), k)
-
-                collection["links"].append(
-                    {
-                        "type": FORMAT_TYPES[F_JSON],
-                        "rel": "{}/coverage-domainset".format(OGC_RELTYPES_BASE),
-                        "title": "Coverage domain set of collection in JSON",
-                        "href": "{}/domainset?f={}".format(coverage_url, F_JSON),
-                    }
-                )
-                collection["links"].append(
-                    {
-                        "type": FORMAT_TYPES[F_HTML],
-                        "rel": "{}/coverage-domainset".format(OGC_RELTYPES_BASE),
-                        "title": "Coverage domain set of collection in HTML",
-                        "href": "{}/domainset?f={}".format(coverage_url, F_HTML),
-                    }
-                )
-                collection["links"].append(
-                    {
-                        "type": FORMAT_TYPES[F_JSON],
-                        "rel": "{}/coverage-rangetype".format(OGC_RELTYPES_BASE),
-                        "title": "Coverage range type of collection in JSON",
-                        "href": "{}/rangetype?f={}".format(coverage_url, F_JSON),
-                    }
-                )
-                collection["links"].append(
-                    {
-                        "type": FORMAT_TYPES[F_HTML],
-                        "rel": "{}/coverage-rangetype".format(OGC_RELTYPES_BASE),
-                        "title": "Coverage range type of collection in HTML",
-                        "href": "{}/rangetype?f={}".format(coverage_url, F_HTML),
-                    }
-                )
-                collection["links"].append(
-                    {
-                        "type": "application/prs.coverage+json",
-                        "rel": "{}/coverage".format(OGC_RELTYPES_BASE),
-                        "title": "Coverage data",
-                        "href": "{}/{}/coverage?f={}".format(
-                            self.get_collections_url(), k, F_JSON
-                        ),
-                    }
-                )
-                if collection_data_format is not None:
-                    collection["links"].append(
-                        {
-                            "type": collection_data_format["mimetype"],
-                            "rel": "{}/coverage".format(OGC_RELTYPES_BASE),
-                            "title": "Coverage data as {}".format(
-                                collection_data_format["name"]
-                            ),
-                            "href": "{}/{}/coverage?f={}".format(
-                                self.get_collections_url(),
-                                k,
-                                collection_data_format["name"],
-                            ),
-                        }
-                    )
-                if dataset is not None:
+                # the collection template does not render the coverage metadata
+                if dataset is not None and not want_html:
                     LOGGER.debug("Creating extended coverage metadata")
                     try:
                         provider_def = get_provider_by_type(
@@ -333,41 +513,7 @@ class CustomPyGeoAPI(API):
                         collection["domainset"] = p.get_coverage_domainset()
                         collection["rangetype"] = p.get_coverage_rangetype()
 
-            try:
-                tile = get_provider_by_type(v["providers"], "tile")
-            except ProviderTypeError:
-                tile = None
-
-            if tile:
-                # TODO: translate
-                LOGGER.debug("Adding tile links")
-                collection["links"].append(
-                    {
-                        "type": FORMAT_TYPES[F_JSON],
-                        "rel": "tiles",
-                        "title": "Tiles as JSON",
-                        "href": "{}/{}/tiles?f={}".format(
-                            self.get_collections_url(), k, F_JSON
-                        ),
-                    }
-                )
-                collection["links"].append(
-                    {
-                        "type": FORMAT_TYPES[F_HTML],
-                        "rel": "tiles",
-                        "title": "Tiles as HTML",
-                        "href": "{}/{}/tiles?f={}".format(
-                            self.get_collections_url(), k, F_HTML
-                        ),
-                    }
-                )
-
-            try:
-                edr = get_provider_by_type(v["providers"], "edr")
-            except ProviderTypeError:
-                edr = None
-
-            if edr and dataset is not None:
+            if "edr" in self._provider_types[k] and dataset is not None:
                 # TODO: translate
                 LOGGER.debug("Adding EDR links")
                 try:
@@ -377,35 +523,29 @@ class CustomPyGeoAPI(API):
                             self.config["resources"][dataset]["providers"], "edr"
                         ),
                     )
-                    parameters = p.get_fields()
-                    if parameters:
-                        collection["parameter-names"] = {}
-                        for f in parameters["field"]:
-                            collection["parameter-names"][f["id"]] = f
+                    # the collection template does not render parameter names
+                    if not want_html:
+                        parameters = p.get_fields()
+                        if parameters:
+                            collection["parameter-names"] = {}
+                            for f in parameters["field"]:
+                                collection["parameter-names"][f["id"]] = f
 
                     for qt in p.get_query_types():
-                        collection["links"].append(
+                        links.append(
                             {
                                 "type": "application/json",
                                 "rel": "data",
-                                "title": "{} query for this collection as JSON".format(
-                                    qt
-                                ),  # noqa
-                                "href": "{}/{}/{}?f={}".format(
-                                    self.get_collections_url(), k, qt, F_JSON
-                                ),
+                                "title": f"{qt} query for this collection as JSON",  # noqa
+                                "href": f"{collection_url}/{qt}?f={F_JSON}",
                             }
                         )
-                        collection["links"].append(
+                        links.append(
                             {
-                                "type": FORMAT_TYPES[F_HTML],
+                                "type": _FT_HTML,
                                 "rel": "data",
-                                "title": "{} query for this collection as HTML".format(
-                                    qt
-                                ),  # noqa
-                                "href": "{}/{}/{}?f={}".format(
-                                    self.get_collections_url(), k, qt, F_HTML
-                                ),
+                                "title": f"{qt} query for this collection as HTML",  # noqa
+                                "href": f"{collection_url}/{qt}?f={F_HTML}",
                             }
                         )
                 except ProviderConnectionError:
@@ -416,64 +556,41 @@ class CustomPyGeoAPI(API):
                 except ProviderTypeError:
                     pass
 
-            if dataset is not None and k == dataset:
+            if dataset is not None:
                 fcm = collection
-                break
-
-            fcm["collections"].append(collection)
+            elif want_jsonld:
+                jsonld_collections.append(
+                    jsonldify_collection(self, collection, locale)
+                )
+            else:
+                fcm["collections"].append(collection)
 
         if dataset is None:
             # TODO: translate
-            fcm["links"].append(
-                {
-                    "type": FORMAT_TYPES[F_JSON],
-                    "rel": request.get_linkrel(F_JSON),
-                    "title": "This document as JSON",
-                    "href": "{}?f={}".format(self.get_collections_url(), F_JSON),
-                }
-            )
-            fcm["links"].append(
-                {
-                    "type": FORMAT_TYPES[F_JSONLD],
-                    "rel": request.get_linkrel(F_JSONLD),
-                    "title": "This document as RDF (JSON-LD)",
-                    "href": "{}?f={}".format(self.get_collections_url(), F_JSONLD),
-                }
-            )
-            fcm["links"].append(
-                {
-                    "type": FORMAT_TYPES[F_HTML],
-                    "rel": request.get_linkrel(F_HTML),
-                    "title": "This document as HTML",
-                    "href": "{}?f={}".format(self.get_collections_url(), F_HTML),
-                }
-            )
+            fcm["links"].extend(_fill_links(self._collections_links, linkrels))
 
-        if request.format == F_HTML:  # render
-            fcm["collections_path"] = self.get_collections_url()
+        if want_html:  # render
+            fcm["collections_path"] = collections_url
             if dataset is not None:
                 content = render_j2_template(
-                    self.config, "collections/collection.html", fcm, request.locale
+                    self.config, "collections/collection.html", fcm, locale
                 )
             else:
                 content = render_j2_template(
-                    self.config, "collections/index.html", fcm, request.locale
+                    self.config, "collections/index.html", fcm, locale
                 )
 
             return headers, 200, content
 
-        if request.format == F_JSONLD:
+        if want_jsonld:
             jsonld = self.fcmld.copy()
             if dataset is not None:
-                jsonld["dataset"] = jsonldify_collection(self, fcm, request.locale)
+                jsonld["dataset"] = jsonldify_collection(self, fcm, locale)
             else:
-                jsonld["dataset"] = [
-                    jsonldify_collection(self, c, request.locale)
-                    for c in fcm.get("collections", [])
-                ]
-            return headers, 200, to_json(jsonld, self.pretty_print)
+                jsonld["dataset"] = jsonld_collections
+            return headers, 200, self._to_json(jsonld)
 
-        return headers, 200, to_json(fcm, self.pretty_print)
+        return headers, 200, self._to_json(fcm)
 
     @gzip
     @pre_process
@@ -494,10 +611,17 @@ class CustomPyGeoAPI(API):
             return self.get_format_exception(request)
         headers = request.get_response_headers()
 
-        if any([dataset is None, dataset not in self.config["resources"].keys()]):
+        if dataset is None or dataset not in self.config["resources"]:
             msg = "Collection not found"
             return self.get_exception(404, headers, request.format, "NotFound", msg)
 
+        cache_key = (dataset, request.locale, request.format)
+        content = self._queryables_cache.get(cache_key)
+        if content is not None:
+            if request.format != F_HTML:
+                headers["Content-Type"] = "application/schema+json"
+            return headers, 200, content
+
         LOGGER.debug("Creating collection queryables")
         try:
             LOGGER.debug("Loading feature provider")
@@ -528,34 +652,29 @@ class CustomPyGeoAPI(API):
 
         queryables = {
             "type": "object",
-            "title": l10n.translate(
-                self.config["resources"][dataset]["title"], request.locale
-            ),
+            "title": _tr(self.config["resources"][dataset]["title"], request.locale),
             "properties": {},
             "$schema": "http://json-schema.org/draft/2019-09/schema",
             "$id": "{}/{}/queryables".format(self.get_collections_url(), dataset),
         }
 
+        properties = queryables["properties"]
+
         if p.fields and (hasattr(p, "spatial") and p.spatial):
-            queryables["properties"]["geometry"] = {
+            properties["geometry"] = {
                 "$ref": "https://geojson.org/schema/Geometry.json"
             }
 
-        for k, v in p.fields.items():
-            show_field = False
-            if p.properties:
-                if k in p.properties:
-                    show_field = True
-            else:
-                show_field = True
+        shown = frozenset(p.properties) if p.properties else None
 
-            if show_field:
-                queryables["properties"][k] = {"title": k, "type": v["type"]}
+        for k, v in p.fields.items():
+            if shown is None or k in shown:
+                properties[k] = {"title": k, "type": v["type"]}
                 if "values" in v:
-                    queryables["properties"][k]["enum"] = v["values"]
+                    properties[k]["enum"] = v["values"]
 
         if request.format == F_HTML:  # render
-            queryables["title"] = l10n.translate(
+            queryables["title"] = _tr(
                 self.config["resources"][dataset]["title"], request.locale
             )
 
@@ -564,12 +683,16 @@ class CustomPyGeoAPI(API):
             content = render_j2_template(
                 self.config, "collections/queryables.html", queryables, request.locale
             )
+            self._queryables_cache[cache_key] = content
 
             return headers, 200, content
 
         headers["Content-Type"] = "application/schema+json"
 
-        return headers, 200, to_json(queryables, self.pretty_print)
+        content = self._to_json(queryables)
+        self._queryables_cache[cache_key] = content
+
+        return headers, 200, content
 
     @gzip
     @pre_process
@@ -591,69 +714,56 @@ class CustomPyGeoAPI(API):
         # Set Content-Language to system locale until provider locale
         # has been determined
         headers = request.get_response_headers(SYSTEM_LOCALE)
+        req_format = request.format
+        locale = request.locale
 
         properties = []
-        reserved_fieldnames = [
-            "bbox",
-            "f",
-            "lang",
-            "limit",
-            "offset",
-            "resulttype",
-            "datetime",
-            "sortby",
-            "properties",
-            "skipGeometry",
-            "q",
-            "filter",
-            "filter-lang",
-        ]
 
-        collections = filter_dict_by_key_value(
-            self.config["resources"], "type", "collection"
-        )
+        collections = self._collections
 
-        if dataset not in collections.keys():
+        if dataset not in collections:
             msg = "Collection not found"
-            return self.get_exception(404, headers, request.format, "NotFound", msg)
+            return self.get_exception(404, headers, req_format, "NotFound", msg)
 
         LOGGER.debug("Processing query parameters")
 
         LOGGER.debug("Processing offset parameter")
-        try:
-            offset = int(request.params.get("offset"))
+        offset = request.params.get("offset")
+        if offset is None:
+            offset = 0
+        else:
+            try:
+                offset = int(offset)
+            except ValueError:
+                msg = "offset value should be an integer"
+                return self.get_exception(
+                    400, headers, req_format, "InvalidParameterValue", msg
+                )
             if offset < 0:
                 msg = "offset value should be positive or zero"
                 return self.get_exception(
-                    400, headers, request.format, "InvalidParameterValue", msg
+                    400, headers, req_format, "InvalidParameterValue", msg
                 )
-        except TypeError as err:
-            LOGGER.warning(err)
-            offset = 0
-        except ValueError:
-            msg = "offset value should be an integer"
-            return self.get_exception(
-                400, headers, request.format, "InvalidParameterValue", msg
-            )
 
         LOGGER.debug("Processing limit parameter")
-        try:
-            limit = int(request.params.get("limit"))
+        limit = request.params.get("limit")
+        if limit is None:
+            limit = self._default_limit
+        else:
+            try:
+                limit = int(limit)
+            except ValueError:
+                msg = "limit value should be an integer"
+                return self.get_exception(
+                    400, headers, req_format, "InvalidParameterValue", msg
+                )
             # TODO: We should do more validation, against the min and max
             #       allowed by the server configuration
             if limit <= 0:
                 msg = "limit value should be strictly positive"
                 return self.get_exception(
-                    400, headers, request.format, "InvalidParameterValue", msg
+                    400, headers, req_format, "InvalidParameterValue", msg
                 )
-        except TypeError as err:
-            LOGGER.warning(err)
-            limit = int(self.config["server"]["limit"])
-        except ValueError:
-            msg = "limit value should be an integer"
-            return self.get_exception(
-                400, headers, request.format, "InvalidParameterValue", msg
-            )
 
         resulttype = request.params.get("resulttype") or "results"
 
@@ -669,7 +779,7 @@ class CustomPyGeoAPI(API):
             except ValueError as err:
                 msg = str(err)
                 return self.get_exception(
-                    400, headers, request.format, "InvalidParameterValue", msg
+                    400, headers, req_format, "InvalidParameterValue", msg
                 )
 
         LOGGER.debug("Processing datetime parameter")
@@ -682,7 +792,7 @@ class CustomPyGeoAPI(API):
         except ValueError as err:
             msg = str(err)
             return self.get_exception(
-                400, headers, request.format, "InvalidParameterValue", msg
+                400, headers, req_format, "InvalidParameterValue", msg
             )
 
         LOGGER.debug("processing q parameter")
@@ -704,23 +814,24 @@ class CustomPyGeoAPI(API):
             except ProviderTypeError:
                 msg = "Invalid provider type"
                 return self.get_exception(
-                    400, headers, request.format, "NoApplicableCode", msg
+                    400, headers, req_format, "NoApplicableCode", msg
                 )
         except ProviderConnectionError:
             msg = "connection error (check logs)"
-            return self.get_exception(
-                500, headers, request.format, "NoApplicableCode", msg
-            )
+            return self.get_exception(500, headers, req_format, "NoApplicableCode", msg)
         except ProviderQueryError:
             msg = "query error (check logs)"
-            return self.get_exception(
-                500, headers, request.format, "NoApplicableCode", msg
-            )
+            return self.get_exception(500, headers, req_format, "NoApplicableCode", msg)
+
+        id_field = p.id_field
+        uri_field = p.uri_field
+        title_field = p.title_field
+        field_names = frozenset(p.fields)
 
         LOGGER.debug("processing property parameters")
         for k, v in request.params.items():
-            if k not in reserved_fieldnames and k in list(p.fields.keys()):
-                LOGGER.debug("Adding property filter {}={}".format(k, v))
+            if k not in _RESERVED_FIELDNAMES and k in field_names:
+                LOGGER.debug("Adding property filter %s=%s", k, v)
                 properties.append((k, v))
 
         LOGGER.debug("processing sort parameter")
@@ -736,10 +847,10 @@ class CustomPyGeoAPI(API):
                     order = s[0]
                     prop = s[1:]
 
-                if prop not in p.fields.keys():
+                if prop not in field_names:
                     msg = "bad sort property"
                     return self.get_exception(
-                        400, headers, request.format, "InvalidParameterValue", msg
+                        400, headers, req_format, "InvalidParameterValue", msg
                     )
 
                 sortby.append({"property": prop, "order": order})
@@ -751,12 +862,12 @@ class CustomPyGeoAPI(API):
 
         if val is not None:
             select_properties = val.split(",")
-            properties_to_check = set(p.properties) | set(p.fields.keys())
+            properties_to_check = field_names.union(p.properties)
 
-            if len(list(set(select_properties) - set(properties_to_check))) > 0:
+            if not properties_to_check.issuperset(select_properties):
                 msg = "unknown properties specified"
                 return self.get_exception(
-                    400, headers, request.format, "InvalidParameterValue", msg
+                    400, headers, req_format, "InvalidParameterValue", msg
                 )
         else:
             select_properties = []
@@ -772,12 +883,12 @@ class CustomPyGeoAPI(API):
         cql_text = request.params.get("filter")
         if cql_text is not None:
             try:
-                filter_ = parse_ecql_text(cql_text)
+                filter_ = _parse_ecql_cached(cql_text)
             except Exception as err:
                 LOGGER.error(err)
                 msg = f"Bad CQL string : {cql_text}"
                 return self.get_exception(
-                    400, headers, request.format, "InvalidParameterValue", msg
+                    400, headers, req_format, "InvalidParameterValue", msg
                 )
         else:
             filter_ = None
@@ -788,26 +899,26 @@ class CustomPyGeoAPI(API):
         if filter_lang not in [None, "cql-text"]:
             msg = "Invalid filter language"
             return self.get_exception(
-                400, headers, request.format, "InvalidParameterValue", msg
+                400, headers, req_format, "InvalidParameterValue", msg
             )
 
         # Get provider locale (if any)
         prv_locale = l10n.get_plugin_locale(provider_def, request.raw_locale)
 
         LOGGER.debug("Querying provider")
-        LOGGER.debug("offset: {}".format(offset))
-        LOGGER.debug("limit: {}".format(limit))
-        LOGGER.debug("resulttype: {}".format(resulttype))
-        LOGGER.debug("sortby: {}".format(sortby))
-        LOGGER.debug("bbox: {}".format(bbox))
-        LOGGER.debug("datetime: {}".format(datetime_))
-        LOGGER.debug("properties: {}".format(properties))
-        LOGGER.debug("select properties: {}".format(select_properties))
-        LOGGER.debug("skipGeometry: {}".format(skip_geometry))
-        LOGGER.debug("language: {}".format(prv_locale))
-        LOGGER.debug("q: {}".format(q))
-        LOGGER.debug("cql_text: {}".format(cql_text))
-        LOGGER.debug("filter-lang: {}".format(filter_lang))
+        LOGGER.debug("offset: %s", offset)
+        LOGGER.debug("limit: %s", limit)
+        LOGGER.debug("resulttype: %s", resulttype)
+        LOGGER.debug("sortby: %s", sortby)
+        LOGGER.debug("bbox: %s", bbox)
+        LOGGER.debug("datetime: %s", datetime_)
+        LOGGER.debug("properties: %s", properties)
+        LOGGER.debug("select properties: %s", select_properties)
+        LOGGER.debug("skipGeometry: %s", skip_geometry)
+        LOGGER.debug("language: %s", prv_locale)
+        LOGGER.debug("q: %s", q)
+        LOGGER.debug("cql_text: %s", cql_text)
+        LOGGER.debug("filter-lang: %s", filter_lang)
 
         try:
             content = p.query(
@@ -824,53 +935,49 @@ class CustomPyGeoAPI(API):
                 language=prv_locale,
                 filterq=filter_,
             )
-        except ProviderConnectionError as err:
-            LOGGER.error(err)
-            msg = "connection error (check logs)"
-            return self.get_exception(
-                500, headers, request.format, "NoApplicableCode", msg
-            )
-        except ProviderQueryError as err:
-            LOGGER.error(err)
-            msg = "query error (check logs)"
-            return self.get_exception(
-                500, headers, request.format, "NoApplicableCode", msg
-            )
         except ProviderGenericError as err:
             LOGGER.error(err)
-            msg = "generic error (check logs)"
-            return self.get_exception(
-                500, headers, request.format, "NoApplicableCode", msg
+            msg = next(
+                msg
+                for error, msg in _PROVIDER_ERR_MSGS.items()
+                if isinstance(err, error)
             )
+            return self.get_exception(500, headers, req_format, "NoApplicableCode", msg)
 
-        serialized_query_params = ""
-        for k, v in request.params.items():
-            if k not in ("f", "offset"):
-                serialized_query_params += "&"
-                serialized_query_params += urllib.parse.quote(k, safe="")
-                serialized_query_params += "="
-                serialized_query_params += urllib.parse.quote(str(v), safe=",")
+        params = request.params
+        if params.keys() <= _UNFORWARDED_PARAMS:
+            # nothing to carry over into the links (the default request)
+            serialized_query_params = ""
+        else:
+            # not urlencode(): keys and values need different safe characters
+            serialized_query_params = "".join(
+                f"&{_fast_quote(k)}={_fast_quote(str(v), ',')}"
+                for k, v in params.items()
+                if k not in _UNFORWARDED_PARAMS
+            )
 
         # TODO: translate titles
-        uri = "{}/{}/items".format(self.get_collections_url(), dataset)
+        collections_url = self.get_collections_url()
+        dataset_path = f"{collections_url}/{dataset}"
+        uri = f"{dataset_path}/items"
         content["links"] = [
             {
                 "type": "application/geo+json",
                 "rel": request.get_linkrel(F_JSON),
                 "title": "This document as GeoJSON",
-                "href": "{}?f={}{}".format(uri, F_JSON, serialized_query_params),
+                "href": f"{uri}?f={F_JSON}{serialized_query_params}",
             },
             {
+                "type": _FT_JSONLD,
                 "rel": request.get_linkrel(F_JSONLD),
-                "type": FORMAT_TYPES[F_JSONLD],
                 "title": "This document as RDF (JSON-LD)",
-                "href": "{}?f={}{}".format(uri, F_JSONLD, serialized_query_params),
+                "href": f"{uri}?f={F_JSONLD}{serialized_query_params}",
             },
             {
-                "type": FORMAT_TYPES[F_HTML],
+                "type": _FT_HTML,
                 "rel": request.get_linkrel(F_HTML),
                 "title": "This document as HTML",
-                "href": "{}?f={}{}".format(uri, F_HTML, serialized_query_params),
+                "href": f"{uri}?f={F_HTML}{serialized_query_params}",
             },
         ]
 
@@ -881,60 +988,64 @@ class CustomPyGeoAPI(API):
                     "type": "application/geo+json",
                     "rel": "prev",
                     "title": "items (prev)",
-                    "href": "{}?offset={}{}".format(uri, prev, serialized_query_params),
+                    "href": f"{uri}?offset={prev}{serialized_query_params}",
                 }
             )
 
-        if len(content["features"]) == limit:
+        feature_count = len(content["features"])
+
+        if feature_count == limit:
             next_ = offset + limit
             content["links"].append(
                 {
                     "type": "application/geo+json",
                     "rel": "next",
                     "title": "items (next)",
-                    "href": "{}?offset={}{}".format(
-                        uri, next_, serialized_query_params
-                    ),
+                    "href": f"{uri}?offset={next_}{serialized_query_params}",
                 }
             )
 
         content["links"].append(
             {
-                "type": FORMAT_TYPES[F_JSON],
-                "title": l10n.translate(collections[dataset]["title"], request.locale),
+                "type": _FT_JSON,
+                "title": _tr(collections[dataset]["title"], locale),
                 "rel": "collection",
                 "href": uri,
             }
         )
 
-        content["timeStamp"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        content["timeStamp"] = (
+            datetime.utcnow().isoformat(timespec="microseconds") + "Z"
+        )
 
         # Set response language to requested provider locale
         # (if it supports language) and/or otherwise the requested pygeoapi
         # locale (or fallback default locale)
-        l10n.set_response_language(headers, prv_locale, request.locale)
+        l10n.set_response_language(headers, prv_locale, locale)
 
-        if request.format == F_HTML:  # render
+        if req_format == F_HTML:  # render
             # For constructing proper URIs to items
 
             content["items_path"] = uri
-            content["dataset_path"] = "/".join(uri.split("/")[:-1])
-            content["collections_path"] = self.get_collections_url()
+            content["dataset_path"] = dataset_path
+            content["collections_path"] = collections_url
 
             content["offset"] = offset
 
-            content["id_field"] = p.id_field
-            if p.uri_field is not None:
-                content["uri_field"] = p.uri_field
-            if p.title_field is not None:
-                content["title_field"] = l10n.translate(p.title_field, request.locale)
+            content["id_field"] = id_field
+            if uri_field is not None:
+                content["uri_field"] = uri_field
+            if title_field is not None:
+                content["title_field"] = _tr(title_field, locale)
                 # If title exists, use it as id in html templates
                 content["id_field"] = content["title_field"]
             content = render_j2_template(
-                self.config, "collections/items/index.html", content, request.locale
+                self.config, "collections/items/index.html", content, locale
             )
             return headers, 200, content
-        elif request.format == "csv":  # render
+        elif req_format == "csv":  # render
+            # The CSV is built in memory rather than streamed: @gzip, the
+            # /oapi response cache and its ETags all need the whole body
             formatter = load_plugin("formatter", {"name": "CSV", "geom": True})
 
             try:
@@ -950,7 +1061,7 @@ class CustomPyGeoAPI(API):
                 LOGGER.error(err)
                 msg = "Error serializing output"
                 return self.get_exception(
-                    500, headers, request.format, "NoApplicableCode", msg
+                    500, headers, req_format, "NoApplicableCode", msg
                 )
 
             headers["Content-Type"] = "{}; charset={}".format(
@@ -958,18 +1069,20 @@ class CustomPyGeoAPI(API):
             )
 
             if p.filename is None:
-                filename = "{}.csv".format(dataset)
+                filename = f"{dataset}.csv"
             else:
-                filename = "{}".format(p.filename)
+                filename = p.filename
 
-            cd = 'attachment; filename="{}"'.format(filename)
-            headers["Content-Disposition"] = cd
+            headers["Content-Disposition"] = f'attachment; filename="{filename}"'
 
             return headers, 200, content
 
-        elif request.format == F_JSONLD:
+        elif req_format == F_JSONLD:
             content = geojson2jsonld(
-                self.config, content, dataset, id_field=(p.uri_field or "id")
+                self.config, content, dataset, id_field=(uri_field or "id")
             )
 
-        return headers, 200, to_json(content, self.pretty_print)
+        # @gzip can only compress str content
+        binary = F_GZIP not in headers.get("Content-Encoding", "")
+
+        return headers, 200, self._to_json(content, binary=binary)
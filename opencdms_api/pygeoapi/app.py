@@ -81,7 +81,7 @@ def get_response(result: tuple):
     response = make_response(content, status)
 
     if headers:
-        response.headers = headers
+        response.headers.update(headers)
     return response
 
 
@@ -301,7 +301,7 @@ def collection_map(collection_id, style_id=None):
     response = make_response(content, status_code)
 
     if headers:
-        response.headers = headers
+        response.headers.update(headers)
 
     return response
 